@@ -1,15 +1,22 @@
 import os
 import time
+import hashlib
+import random
+import asyncio
 import datetime
 import pandas as pd
 import calendar
 from dateutil.relativedelta import relativedelta
+from google.api_core import exceptions
 from google.cloud import bigquery
 from google.oauth2 import service_account
-from google.analytics.data_v1beta import BetaAnalyticsDataClient
+from google.rpc import error_details_pb2
+from google.analytics.data_v1beta import BetaAnalyticsDataAsyncClient
+from google.analytics.data_v1beta.services.beta_analytics_data.transports import BetaAnalyticsDataGrpcAsyncIOTransport
 from google.analytics.data_v1beta.types import (
+    BatchRunReportsRequest,
+    BatchRunReportsResponse,
     DateRange,
-    Dimension,
     Filter,
     FilterExpression,
     Metric,
@@ -21,7 +28,65 @@ from google.analytics.data_v1beta.types import (
 KEY_FILE_LOCATION = os.path.expanduser('~/PATH TO YOUR GOOGLE API KEY JSON FILE')
 credentials = service_account.Credentials.from_service_account_file(KEY_FILE_LOCATION)
 bigquery_client = bigquery.Client(credentials=credentials, project=credentials.project_id)
-analytics_client = BetaAnalyticsDataClient(credentials=credentials)
+
+# GA4 allows 10 concurrent requests per property, keep in flight requests safely under that quota
+MAX_CONCURRENT_REQUESTS = 8
+# Requests are spread over several gRPC channels so they are not all multiplexed over a single HTTP/2 connection
+ANALYTICS_CHANNELS = 4
+
+# GA4 responses are cached on disk so reruns after a failure don't refetch completed months
+CACHE_DIR = os.path.expanduser('~/.cache/ga4')
+# Entries written after GA4 finished processing their period are cached indefinitely. Entries written earlier may
+# hold partial figures and expire after this many seconds
+CURRENT_MONTH_CACHE_TTL = 60 * 60
+# Days GA4 takes to finish processing a period after it ends
+CACHE_SETTLE_DAYS = 2
+
+# Output column names for the activeUsers, totalUsers and sessions metrics of each report
+REPORT_COLUMNS = {
+    "total": ("activeUsers", "totalUsers", "totalSessions"),
+    "organic": ("organicActiveUsers", "organicTotalUsers", "organicSessions"),
+    "total_filtered": ("activeUsersFiltered", "totalUsersFiltered", "totalSessionsFiltered"),
+    "organic_filtered": ("organicActiveUsersFiltered", "organicTotalUsersFiltered", "organicSessionsFiltered"),
+}
+
+# Column layout of the exported CSV
+OUTPUT_COLUMNS = [
+    *REPORT_COLUMNS["total"],
+    "month",
+    *REPORT_COLUMNS["organic"],
+    *REPORT_COLUMNS["total_filtered"],
+    *REPORT_COLUMNS["organic_filtered"],
+    "domain",
+]
+
+# Errors worth retrying, anything else (PermissionDenied, InvalidArgument, ...) fails fast
+RETRYABLE_ERRORS = (
+    exceptions.ResourceExhausted,
+    exceptions.ServiceUnavailable,
+    exceptions.DeadlineExceeded,
+    exceptions.InternalServerError,
+)
+
+
+def create_analytics_client():
+    """
+    Creates an async GA4 client with its own gRPC channel. Must be called from within the running event loop.
+
+    The channel opts out of gRPC's global subchannel pool, otherwise channels with identical arguments would
+    share one connection and creating several clients would gain nothing.
+
+    :return: BetaAnalyticsDataAsyncClient bound to a dedicated channel.
+    """
+    channel = BetaAnalyticsDataGrpcAsyncIOTransport.create_channel(
+        credentials=credentials,
+        options=[
+            ("grpc.use_local_subchannel_pool", 1),
+            ("grpc.max_send_message_length", -1),
+            ("grpc.max_receive_message_length", -1),
+        ]
+    )
+    return BetaAnalyticsDataAsyncClient(transport=BetaAnalyticsDataGrpcAsyncIOTransport(channel=channel))
 
 
 def fetch_ids():
@@ -31,10 +96,10 @@ def fetch_ids():
 
     The function collects these entries and returns them as a list of tuples, where each tuple
     contains:
-    - domain (str): The netloc domain name associated with the property.
     - property_id (str): The identifier for the view associated with the domain.
+    - domain (str): The netloc domain name associated with the property.
 
-    :return: List[Tuple[str, str]]: A list of tuples, each containing the domain and its associated property ID.
+    :return: List[Tuple[str, str]]: A list of tuples, each containing the property ID and its associated domain.
     """
     sql = f"""
     SELECT * FROM `YOUR TABLE IN BIGQUERY`
@@ -43,300 +108,315 @@ def fetch_ids():
     # Execute the query
     properties_job = bigquery_client.query(sql)
 
-    # Get the results
-    properties_results = properties_job.result()
+    # Large results are downloaded through the BigQuery Storage Read API, the client is only created when needed.
+    # Small results that fit in the first page are read from that page instead
+    properties_df = properties_job.result().to_dataframe(create_bqstorage_client=True)
 
-    return [(row.property_id, row.domain) for row in properties_results]
+    return list(properties_df[["property_id", "domain"]].itertuples(index=False, name=None))
 
 
-def organic_filter():
+def _string_filter(field_name, value, match_type=None):
     """
-    :return: Filter expression for organic traffic only
+    :return: Filter expression matching a string dimension against value. Without a match_type GA4 matches exactly,
+    the field is left unset in that case so the serialized request stays the same.
     """
-    return FilterExpression(
-        filter=Filter(
-            field_name="sessionDefaultChannelGroup",
-            string_filter=Filter.StringFilter(value="Organic Search"),
-        )
-    )
+    string_filter = Filter.StringFilter(value=value)
+    if match_type is not None:
+        string_filter.match_type = match_type
+
+    return FilterExpression(filter=Filter(field_name=field_name, string_filter=string_filter))
 
 
-def blog_filter():
+def _not(expression):
     """
-    :return: Filter expression to remove blog traffic
+    :return: Filter expression excluding everything matched by expression
     """
-    return FilterExpression(not_expression=FilterExpression(filter=Filter(
-        field_name="landingPage",
-        string_filter=Filter.StringFilter(
-            value="blog",
-            match_type=Filter.StringFilter.MatchType.CONTAINS)
-                )))
+    return FilterExpression(not_expression=expression)
 
 
-def blog_organic_filter():
-    """
-    :return: Combines the previous 2 filters and returns a single filter that filters on blog traffic, and
-    organic traffic returning organic non blog traffic for a particular site. Use this as a base to construct
-    other filters https://developers.google.com/analytics/devguides/reporting/data/v1/rest/v1beta/FilterExpression
+def _and(*expressions):
     """
-    return FilterExpression(
-                and_group=FilterExpressionList(expressions=[
-                    FilterExpression(filter=Filter(
-                        field_name="sessionDefaultChannelGroup",
-                        string_filter=Filter.StringFilter(value="Organic Search")
-                    )),
-                    FilterExpression(not_expression=FilterExpression(filter=Filter(
-                        field_name="landingPage",
-                        string_filter=Filter.StringFilter(
-                            value="blog",
-                            match_type=Filter.StringFilter.MatchType.CONTAINS)
-                    )))
-                ])
-            )
-
-
-def run_total(property_id, start_date, end_date, max_retries=3):
+    :return: Filter expression matching only when all expressions match. Use this as a base to construct other
+    filters https://developers.google.com/analytics/devguides/reporting/data/v1/rest/v1beta/FilterExpression
     """
-    Generates a GA4 traffic report for the specified property without any traffic filters.
+    return FilterExpression(and_group=FilterExpressionList(expressions=list(expressions)))
 
-    :param property_id: GA4 Property ID.
-    :param start_date: Start date for the report.
-    :param end_date: End date for the report.
-    :param max_retries: Maximum number of retry attempts due to API failures.
-    :return: Traffic report including active users, total users, and sessions.
+
+# Filter expressions are built once and shared by every report request.
+# Organic traffic only
+ORGANIC_FILTER = _string_filter("sessionDefaultChannelGroup", "Organic Search")
+# Removes blog traffic
+BLOG_FILTER = _not(_string_filter("landingPage", "blog", Filter.StringFilter.MatchType.CONTAINS))
+# Organic non blog traffic for a particular site
+BLOG_ORGANIC_FILTER = _and(ORGANIC_FILTER, BLOG_FILTER)
+
+
+async def _retry(fn, description, max_retries=3, base=1.0, cap=30.0):
+    """
+    Awaits fn, retrying transient GA4 API failures with capped exponential backoff and jitter.
+
+    :param fn: Zero argument coroutine function performing the API request.
+    :param description: Short description of the request used in log messages.
+    :param max_retries: Maximum number of attempts before giving up.
+    :param base: Delay in seconds before the first retry.
+    :param cap: Upper bound in seconds for the backoff delay.
+    :return: The result of fn, or None if every attempt failed.
     """
-    retries = 0
-    while retries < max_retries:
+    for attempt in range(max_retries):
         try:
-            request = RunReportRequest(
-                property=f"properties/{property_id}",
-                dimensions=[],
-                metrics=[
-                    Metric(name="activeUsers"),
-                    Metric(name="totalUsers"),
-                    Metric(name="sessions")
-                ],
-                date_ranges=[DateRange(start_date=f"{start_date}", end_date=f"{end_date}")]
-            )
-            total_response = analytics_client.run_report(request)
-            return total_response
-
-        except Exception as e:
-            print(f'Error fetching data for id: {property_id} on {start_date}: {e}. Attempt {retries+1} of {max_retries}')
-            time.sleep(5)
-            retries += 1
+            return await fn()
+
+        except RETRYABLE_ERRORS as e:
+            print(f'Error fetching data for {description}: {e}. Attempt {attempt + 1} of {max_retries}')
+            if attempt + 1 == max_retries:
+                break
+
+            delay = min(cap, base * 2 ** attempt) * (1 + random.random() * 0.5)
+            # Honor the server's retry hint, sent over gRPC as a google.rpc.RetryInfo error detail
+            for detail in getattr(e, 'details', None) or []:
+                if isinstance(detail, error_details_pb2.RetryInfo):
+                    hint = detail.retry_delay.ToTimedelta().total_seconds()
+                    # Jittered like the backoff so requests throttled in the same burst don't all retry at once
+                    delay = min(cap, hint) * (1 + random.random() * 0.5)
+            await asyncio.sleep(delay)
+
+        except exceptions.GoogleAPICallError as e:
+            print(f'Unrecoverable error fetching data for {description}: {e}')
+            return None
 
     print(f'Failed to fetch data after {max_retries} attempts.')
     return None
 
 
-def run_organic(property_id, start_date, end_date, max_retries=3):
+def _cache_path(request, property_id, start_date, end_date):
+    """
+    :return: Cache file path for a batch request. The hash of the serialized request covers its filters and metrics,
+    so changing either never serves stale reports.
     """
-    Generates a GA4 traffic report for the specified property filtered for organic traffic.
+    request_hash = hashlib.sha1(BatchRunReportsRequest.serialize(request)).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{property_id}_{start_date}_{end_date}_{request_hash}.pb")
 
-    :param property_id: GA4 Property ID.
-    :param start_date: Start date for the report.
-    :param end_date: End date for the report.
-    :param max_retries: Maximum number of retry attempts due to API failures.
-    :return: Traffic report for organic traffic including active users, total users, and sessions.
+
+def load_cached_response(cache_path, end_date):
     """
-    retries = 0
-    while retries < max_retries:
-        try:
-            filter_expression = organic_filter()
-
-            request = RunReportRequest(
-                property=f"properties/{property_id}",
-                dimensions=[],
-                metrics=[
-                    Metric(name="activeUsers"),
-                    Metric(name="totalUsers"),
-                    Metric(name="sessions")
-                ],
-                date_ranges=[DateRange(start_date=f"{start_date}", end_date=f"{end_date}")],
-                dimension_filter=filter_expression,
-            )
-            # Execute GA4 request
-            organic_response = analytics_client.run_report(request)
-            return organic_response
+    Loads a previously fetched batch response from the disk cache.
 
-        except Exception as e:
-            print(f'Error fetching data for id: {property_id} on {start_date}: {e}. Attempt {retries + 1} of {max_retries}')
-            time.sleep(5)
-            retries += 1
+    :param cache_path: Cache file path for the request.
+    :param end_date: End date of the request. Entries written before GA4 finished processing the period may hold
+                     partial figures and expire after CURRENT_MONTH_CACHE_TTL.
+    :return: The cached BatchRunReportsResponse, or None if it is missing, expired or unreadable.
+    """
+    if not os.path.exists(cache_path):
+        return None
 
-    print(f'Failed to fetch data after {max_retries} attempts.')
-    return None
+    # An unreadable entry, e.g. written by an incompatible library version, is treated as a cache miss
+    try:
+        # Judge by when the entry was written, not by today: an entry fetched before its period settled keeps
+        # its partial figures however old the period gets
+        written_at = os.path.getmtime(cache_path)
+        settled_date = datetime.date.fromisoformat(end_date) + datetime.timedelta(days=CACHE_SETTLE_DAYS + 1)
+        settled_at = datetime.datetime.combine(settled_date, datetime.time()).timestamp()
+        if written_at < settled_at and time.time() - written_at > CURRENT_MONTH_CACHE_TTL:
+            return None
 
+        with open(cache_path, 'rb') as f:
+            return BatchRunReportsResponse.deserialize(f.read())
 
-def run_total_filtered(property_id, start_date, end_date, max_retries=3):
-    """
-    Generates a GA4 traffic report for the specified property, filtering out blog traffic.
+    except Exception as e:
+        print(f'Ignoring unreadable cache entry {cache_path}: {e}')
+        return None
 
-    :param property_id: GA4 Property ID.
-    :param start_date: Start date for the report.
-    :param end_date: End date for the report.
-    :param max_retries: Maximum number of retry attempts due to API failures.
-    :return: Traffic report excluding blog traffic, including active users, total users, and sessions.
+
+def save_cached_response(cache_path, response):
     """
-    retries = 0
-    while retries < max_retries:
-        try:
-            filter_expression = blog_filter()
-
-            request = RunReportRequest(
-                property=f"properties/{property_id}",
-                dimensions=[],
-                metrics=[
-                    Metric(name="activeUsers"),
-                    Metric(name="totalUsers"),
-                    Metric(name="sessions")
-                ],
-                date_ranges=[DateRange(start_date=f"{start_date}", end_date=f"{end_date}")],
-                dimension_filter=filter_expression,
-            )
-            # Execute GA4 request
-            total_response_filtered = analytics_client.run_report(request)
-            return total_response_filtered
+    Writes a batch response to the disk cache. The file is written under a temporary name first so an interrupted
+    run never leaves a truncated cache entry behind.
 
-        except Exception as e:
-            print(f'Error fetching data for id: {property_id} on {start_date}: {e}. Attempt {retries+1} of {max_retries}')
-            time.sleep(5)
-            retries += 1
+    :param cache_path: Cache file path for the request.
+    :param response: BatchRunReportsResponse to store.
+    """
+    # Failing to cache (full disk, read only home directory, ...) must not discard a successful fetch
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(BatchRunReportsResponse.serialize(response))
+        os.replace(tmp_path, cache_path)
 
-    print(f'Failed to fetch data after {max_retries} attempts.')
-    return None
+    except OSError as e:
+        print(f'Failed to write cache entry {cache_path}: {e}')
 
 
-def run_organic_filtered(property_id, start_date, end_date, max_retries=3):
+def build_report_request(property_id, start_date, end_date, filter_expression=None):
     """
-    Generates a GA4 traffic report for the specified property, filtering only for organic traffic and excluding blog traffic.
+    Builds a GA4 report request for the specified property, optionally restricted by a traffic filter.
 
     :param property_id: GA4 Property ID.
     :param start_date: Start date for the report.
     :param end_date: End date for the report.
+    :param filter_expression: Optional dimension filter to apply to the report.
+    :return: Report request for active users, total users, and sessions.
+    """
+    return RunReportRequest(
+        property=f"properties/{property_id}",
+        dimensions=[],
+        metrics=[
+            Metric(name="activeUsers"),
+            Metric(name="totalUsers"),
+            Metric(name="sessions")
+        ],
+        date_ranges=[DateRange(start_date=f"{start_date}", end_date=f"{end_date}")],
+        dimension_filter=filter_expression,
+    )
+
+
+async def run_reports(analytics_client, semaphore, property_id, start_date, end_date, max_retries=3):
+    """
+    Generates the total, organic, blog filtered total and blog filtered organic GA4 traffic reports for the
+    specified property in a single batch request.
+
+    Responses are served from the disk cache in CACHE_DIR when available.
+
+    :param analytics_client: Async GA4 client used to send the request.
+    :param semaphore: Limits the number of GA4 requests in flight, it is released while backing off.
+    :param property_id: GA4 Property ID.
+    :param start_date: Start date for the reports.
+    :param end_date: End date for the reports.
     :param max_retries: Maximum number of retry attempts due to API failures.
-    :return: Organic traffic report excluding blog content, including active users, total users, and sessions.
+    :return: Dict of traffic reports keyed by report kind, or None if the request failed.
     """
-    retries = 0
-    while retries < max_retries:
-        try:
-            filter_expression = blog_organic_filter()
-
-            request = RunReportRequest(
-                property=f"properties/{property_id}",
-                dimensions=[],
-                metrics=[
-                    Metric(name="activeUsers"),
-                    Metric(name="totalUsers"),
-                    Metric(name="sessions")
-                ],
-                date_ranges=[DateRange(start_date=f"{start_date}", end_date=f"{end_date}")],
-                dimension_filter=filter_expression,
-            )
-            # Execute GA4 request
-            organic_response_filtered = analytics_client.run_report(request)
-            return organic_response_filtered
+    # The filtered variants are requested separately rather than derived from a channel / landing page breakdown:
+    # users are counted distinctly, so they can't be summed across breakdown rows or subtracted between reports
+    request = BatchRunReportsRequest(
+        property=f"properties/{property_id}",
+        requests=[
+            build_report_request(property_id, start_date, end_date),
+            build_report_request(property_id, start_date, end_date, ORGANIC_FILTER),
+            build_report_request(property_id, start_date, end_date, BLOG_FILTER),
+            build_report_request(property_id, start_date, end_date, BLOG_ORGANIC_FILTER),
+        ]
+    )
+    cache_path = _cache_path(request, property_id, start_date, end_date)
+    response = load_cached_response(cache_path, end_date)
+
+    if response is None:
+        async def batch_run_reports():
+            async with semaphore:
+                return await analytics_client.batch_run_reports(request)
 
+        # Execute GA4 request. Any unexpected error only skips this property and month, as it did before the
+        # requests were gathered, instead of aborting every other request in flight
+        try:
+            response = await _retry(batch_run_reports, description=f'id: {property_id} on {start_date}',
+                                    max_retries=max_retries)
         except Exception as e:
-            print(f'Error fetching data for id: {property_id} on {start_date}: {e}. Attempt {retries+1} of {max_retries}')
-            time.sleep(5)
-            retries += 1
+            print(f'Unexpected error fetching data for id: {property_id} on {start_date}: {e}')
+            return None
+        if response is None:
+            return None
 
-    print(f'Failed to fetch data after {max_retries} attempts.')
-    return None
+        save_cached_response(cache_path, response)
+
+    # Reports come back in request order, which matches REPORT_COLUMNS
+    return dict(zip(REPORT_COLUMNS, response.reports))
 
 
-def transform_response(response):
+def build_row(responses, month, domain):
     """
-    Transforms the GA4 API response into a pandas DataFrame.
+    Flattens the reports for one property and month into a single output row.
 
-    :param response: The response data from the GA4 API to convert.
-    :return: A DataFrame containing the response data, structured for analysis.
+    None of the reports request dimensions, so each one is a single aggregate row and its metric values are read
+    directly.
+
+    :param responses: Dict of traffic reports keyed by report kind, as returned by run_reports.
+    :param month: First day of the month the reports cover.
+    :param domain: Domain associated with the property.
+    :return: Dict keyed by output column, or None if the property had no traffic for the month.
     """
-    # Extract GA4 data into pandas DataFrame
-    data = []
-    for row in response.rows:
-        dimension_values = [value.value for value in row.dimension_values]
-        metric_values = [value.value for value in row.metric_values]
-        data.append(dimension_values + metric_values)
-    columns = ([dimension.name for dimension in response.dimension_headers] +
-               [metric.name for metric in response.metric_headers])
+    if not responses["total"].rows:
+        return None
 
-    return pd.DataFrame(data, columns=columns)
+    row = {"month": month, "domain": domain}
+    for kind, columns in REPORT_COLUMNS.items():
+        report_rows = responses[kind].rows
+        # Filtered reports come back without rows when no traffic matches, count those as 0.
+        # Users and sessions are integer metrics, parsing them here gives int64 columns rather than object
+        metric_values = report_rows[0].metric_values if report_rows else []
+        values = [int(value.value) for value in metric_values] or [0] * len(columns)
+        row.update(zip(columns, values))
 
+    return row
 
-def main():
-    # Timing how long the script takes to run
-    start_time = time.time()
 
-    # Create a holding frame
-    accumulated_df = pd.DataFrame()
+def month_ranges(start_date, end_date):
+    """
+    Splits the reporting period into calendar months.
 
-    # Will iterate through the dates by Month and return a list
-    start_date = datetime.date(2023, 7, 1)
-    # Note this is the end date range of the entire pull this is different from the end date within each function
-    end_date = datetime.date(2024, 1, 31)
+    :param start_date: First day of the reporting period.
+    :param end_date: Last day of the reporting period.
+    :return: List of (start_date, end_date) string tuples, one per month, formatted as YYYY-MM-DD.
+    """
+    months = []
     curr_date = start_date
-
     while curr_date <= end_date:
-
         # Grabs the last day of the month for the end date range parameter within the reporting functions
         last_day = calendar.monthrange(curr_date.year, curr_date.month)[1]
         month_end_date = datetime.date(curr_date.year, curr_date.month, last_day)
+        months.append((curr_date.strftime('%Y-%m-%d'), month_end_date.strftime('%Y-%m-%d')))
 
-        for property_id, domain, stream_id in fetch_ids():
-
-            print(f'Running for date range: {curr_date} and {month_end_date} for {domain}')
-
-            start_date_str = curr_date.strftime('%Y-%m-%d')
-            end_date_str = month_end_date.strftime('%Y-%m-%d')
-
-            organic_response = run_organic(property_id, start_date_str, end_date_str)
-            total_response = run_total(property_id, start_date_str, end_date_str)
-            organic_response_filter = run_organic_filtered(property_id, start_date_str, end_date_str)
-            total_response_filter = run_total_filtered(property_id, start_date_str, end_date_str)
-
-            if organic_response_filter is not None and total_response_filter is not None:
-                df_organic = transform_response(organic_response)
-                df_total = transform_response(total_response)
-                df_organic_filter = transform_response(organic_response_filter)
-                df_total_filter = transform_response(total_response_filter)
-
-                df_organic.rename(columns={"activeUsers": "organicActiveUsers",
-                                           "totalUsers": "organicTotalUsers",
-                                           "sessions": "organicSessions"}, inplace=True)
-                df_total.rename(columns={"activeUsers": "activeUsers",
-                                         "totalUsers": "totalUsers",
-                                         "sessions": "totalSessions"}, inplace=True)
-                df_organic_filter.rename(columns={"activeUsers": "organicActiveUsersFiltered",
-                                                  "totalUsers": "organicTotalUsersFiltered",
-                                                  "sessions": "organicSessionsFiltered"}, inplace=True)
-                df_total_filter.rename(columns={"activeUsers": "activeUsersFiltered",
-                                                "totalUsers": "totalUsersFiltered",
-                                                "sessions": "totalSessionsFiltered"}, inplace=True)
-
-                df_organic["month"] = start_date_str
-                df_total["month"] = start_date_str
-                df_organic_filter["month"] = start_date_str
-                df_total_filter["month"] = start_date_str
+        # Increment date
+        curr_date += relativedelta(months=1)
 
-                df_merged = pd.merge(df_total, df_organic, on=["month"], how="left")
-                df_merged_filter = pd.merge(df_total_filter, df_organic_filter, on=["month"], how="left")
-                df_combined = pd.merge(df_merged, df_merged_filter, on=["month"], how="left")
+    return months
 
-                df_combined.fillna(0, inplace=True)
 
-                # Add domain column and pageURL
-                df_combined['domain'] = domain
+async def main():
+    # Timing how long the script takes to run
+    start_time = time.time()
 
-                # Append to the accumulated DataFrame
-                accumulated_df = pd.concat([accumulated_df, df_combined], ignore_index=True)
+    # Holds one row per property and month, turned into a DataFrame once at the end
+    rows = []
 
-        # Increment date
-        curr_date += relativedelta(months=1)
+    # Will iterate through the dates by Month and return a list
+    start_date = datetime.date(2023, 7, 1)
+    # Note this is the end date range of the entire pull this is different from the end date within each function
+    end_date = datetime.date(2024, 1, 31)
 
-    file_path_str = f"~/Downloads/{datetime.date.today} GA4 Monthly.csv"
+    # The property list is the same for every month, so only query BigQuery once
+    ids = fetch_ids()
+
+    # Months are independent of each other, so every property and month is fetched concurrently.
+    # Jobs are ordered by month then property, which is the order rows are written out in
+    jobs = [(property_id, domain, month_start, month_end)
+            for month_start, month_end in month_ranges(start_date, end_date)
+            for property_id, domain in ids]
+    print(f'Running {len(jobs)} property months between {start_date} and {end_date}')
+
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    analytics_clients = [create_analytics_client() for _ in range(ANALYTICS_CHANNELS)]
+
+    try:
+        # Round robin the jobs over the client channels
+        results = await asyncio.gather(*[
+            run_reports(analytics_clients[i % ANALYTICS_CHANNELS], semaphore, property_id, month_start, month_end)
+            for i, (property_id, domain, month_start, month_end) in enumerate(jobs)
+        ])
+
+    finally:
+        for analytics_client in analytics_clients:
+            await analytics_client.transport.close()
+
+    for (property_id, domain, month_start, month_end), responses in zip(jobs, results):
+        if responses is not None:
+            row = build_row(responses, month_start, domain)
+            if row is not None:
+                rows.append(row)
+
+    # Cast explicitly so the metric columns are int64 even when no rows were fetched
+    accumulated_df = pd.DataFrame(rows, columns=OUTPUT_COLUMNS).astype(
+        {column: 'int64' for columns in REPORT_COLUMNS.values() for column in columns})
+
+    file_path_str = f"~/Downloads/{datetime.date.today():%Y-%m-%d} GA4 Monthly.csv"
     file_path = os.path.expanduser(file_path_str)
     accumulated_df.to_csv(file_path, index=False)
 
@@ -345,4 +425,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())